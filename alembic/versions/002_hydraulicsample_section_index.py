@@ -0,0 +1,39 @@
+"""Composite index on hydraulic sample section and datetime
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '002'
+down_revision: Union[str, Sequence[str], None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index hydraulic samples by section and time window."""
+    op.create_index('idx_hydraulicsample_section_datetime_value',
+                    'hydraulicsample',
+                    ['_boreholesection_oid', 'datetime_value'],
+                    if_not_exists=True)
+    # the composite index leads with the section, which covers lookups
+    # by section alone as well
+    op.drop_index('ix_hydraulicsample__boreholesection_oid',
+                  table_name='hydraulicsample',
+                  if_exists=True)
+
+
+def downgrade() -> None:
+    """Restore the section index and remove the section/datetime index."""
+    op.create_index('ix_hydraulicsample__boreholesection_oid',
+                    'hydraulicsample',
+                    ['_boreholesection_oid'],
+                    if_not_exists=True)
+    op.drop_index('idx_hydraulicsample_section_datetime_value',
+                  table_name='hydraulicsample',
+                  if_exists=True)
@@ -0,0 +1,37 @@
+"""Indexes for the borehole location and section epoch filters
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '003'
+down_revision: Union[str, Sequence[str], None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index boreholes by location and sections by epoch."""
+    op.create_index('idx_borehole_latitude_longitude',
+                    'borehole',
+                    ['latitude_value', 'longitude_value'],
+                    if_not_exists=True)
+    op.create_index('idx_boreholesection_starttime_endtime',
+                    'boreholesection',
+                    ['starttime', 'endtime'],
+                    if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Remove the location and epoch indexes."""
+    op.drop_index('idx_boreholesection_starttime_endtime',
+                  table_name='boreholesection',
+                  if_exists=True)
+    op.drop_index('idx_borehole_latitude_longitude',
+                  table_name='borehole',
+                  if_exists=True)
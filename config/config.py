@@ -16,6 +16,11 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
     DB_NAME: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: int = 30
+
+    CACHE_MAX_AGE: int = 0
 
     ALLOW_ORIGINS: list
     ALLOW_ORIGIN_REGEX: str
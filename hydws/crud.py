@@ -1,8 +1,10 @@
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from sqlalchemy import delete, func, insert, select, text
-from sqlalchemy.ext.asyncio import AsyncSession
+import pandas as pd
+from sqlalchemy import (Row, Select, and_, delete, func, insert, select,
+                        text)
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 from sqlalchemy.orm import joinedload
 
 from hydws.database import pandas_read_sql
@@ -22,20 +24,24 @@ async def read_boreholes(db: AsyncSession,
 
     statement = select(Borehole).options(joinedload(Borehole.sections))
 
+    clauses = []
     if starttime or endtime:
         statement = statement.join(BoreholeSection)
     if starttime:
-        statement = statement.where(BoreholeSection.endtime >= starttime)
+        clauses.append(BoreholeSection.endtime >= starttime)
     if endtime:
-        statement = statement.where(BoreholeSection.starttime <= endtime)
-    if minlongitude:
-        statement = statement.where(Borehole.longitude_value >= minlongitude)
-    if maxlongitude:
-        statement = statement.where(Borehole.longitude_value <= maxlongitude)
-    if minlatitude:
-        statement = statement.where(Borehole.latitude_value >= minlatitude)
-    if maxlatitude:
-        statement = statement.where(Borehole.latitude_value <= maxlatitude)
+        clauses.append(BoreholeSection.starttime <= endtime)
+    if minlongitude is not None:
+        clauses.append(Borehole.longitude_value >= minlongitude)
+    if maxlongitude is not None:
+        clauses.append(Borehole.longitude_value <= maxlongitude)
+    if minlatitude is not None:
+        clauses.append(Borehole.latitude_value >= minlatitude)
+    if maxlatitude is not None:
+        clauses.append(Borehole.latitude_value <= maxlatitude)
+
+    # apply all filters at once instead of copying the statement per filter
+    statement = statement.where(*clauses)
 
     result = await db.execute(statement)
 
@@ -139,14 +145,25 @@ async def read_section(section_id: str, db: AsyncSession):
     return result.scalar_one_or_none()
 
 
-async def read_section_oid(section_id: int, db: AsyncSession):
+async def read_borehole_section_oids(borehole_id: str,
+                                     section_id: str,
+                                     db: AsyncSession) -> Row | None:
+    """
+    Look up a borehole and one of its sections with a single query.
 
-    statement = select(BoreholeSection._oid)
-    statement = statement.where(
-        BoreholeSection.publicid == section_id)
+    :return: None if the borehole does not exist. Otherwise a row with
+        `borehole_oid` and `section_oid`, the latter being None if the
+        borehole has no section with that publicid.
+    """
+    statement = select(Borehole._oid.label('borehole_oid'),
+                       BoreholeSection._oid.label('section_oid')) \
+        .outerjoin(BoreholeSection,
+                   and_(BoreholeSection._borehole_oid == Borehole._oid,
+                        BoreholeSection.publicid == section_id)) \
+        .where(Borehole.publicid == borehole_id)
     result = await db.execute(statement)
 
-    return result.scalar_one_or_none()
+    return result.one_or_none()
 
 
 async def create_section(section: dict,
@@ -183,27 +200,108 @@ async def create_section(section: dict,
     return section_db
 
 
+def hydraulics_filter(section_oid: int | list[int],
+                      starttime: datetime = None,
+                      endtime: datetime = None) -> list:
+    if isinstance(section_oid, list):
+        clauses = [HydraulicSample._boreholesection_oid.in_(section_oid)]
+    else:
+        clauses = [HydraulicSample._boreholesection_oid == section_oid]
+
+    if starttime:
+        clauses.append(HydraulicSample.datetime_value >= starttime)
+    if endtime:
+        clauses.append(HydraulicSample.datetime_value <= endtime)
+
+    return clauses
+
+
+def hydraulic_columns(defer_cols: list = None) -> list:
+    cols = HydraulicSample.__table__.c
+
+    if defer_cols:
+        return [col for col in cols if col not in defer_cols]
+
+    return list(cols)
+
+
+def hydraulics_statement(section_oid: int | list[int],
+                         starttime: datetime = None,
+                         endtime: datetime = None,
+                         columns: list = None) -> Select:
+    return select(*(columns or hydraulic_columns())) \
+        .where(*hydraulics_filter(section_oid, starttime, endtime)) \
+        .order_by(HydraulicSample.datetime_value)
+
+
+async def read_populated_hydraulic_columns(section_oid: int | list[int],
+                                           db: AsyncSession,
+                                           starttime: datetime = None,
+                                           endtime: datetime = None,
+                                           defer_cols: list = None) \
+        -> list | None:
+    """
+    Find the hydraulic sample columns which have a value in the range.
+
+    Counting in the database avoids transferring columns which would
+    only be dropped again afterwards.
+
+    :return: The columns to select, None if there are no samples.
+    """
+    cols = hydraulic_columns(defer_cols)
+
+    statement = select(func.count(), *[func.count(col) for col in cols]) \
+        .where(*hydraulics_filter(section_oid, starttime, endtime))
+    samples, *counts = (await db.execute(statement)).one()
+
+    if samples == 0:
+        return None
+
+    return [col for col, count in zip(cols, counts) if count > 0]
+
+
 async def read_hydraulics_df(section_oid: str,
                              db,
                              starttime: datetime = None,
                              endtime: datetime = None,
-                             defer_cols: list = None) -> List[HydraulicSample]:
-    cols = HydraulicSample.__table__.c
+                             columns: list = None) -> List[HydraulicSample]:
+    statement = hydraulics_statement(
+        section_oid, starttime, endtime, columns)
 
-    if defer_cols:
-        cols = [col for col in cols if col not in defer_cols]
+    return await pandas_read_sql(statement, db)
 
-    statement = select(*cols) \
-        .where(HydraulicSample._boreholesection_oid == section_oid)
 
-    if starttime:
-        statement = statement.where(
-            HydraulicSample.datetime_value >= starttime)
-    if endtime:
-        statement = statement.where(
-            HydraulicSample.datetime_value <= endtime)
+async def read_sections_hydraulics_df(section_oids: list[int],
+                                      db: AsyncSession,
+                                      starttime: datetime = None,
+                                      endtime: datetime = None,
+                                      columns: list = None) \
+        -> dict[int, pd.DataFrame]:
+    """
+    Read the hydraulic samples of several sections with a single query.
 
-    return await pandas_read_sql(statement, db)
+    :return: The samples of each section which has any, by section oid.
+    """
+    statement = hydraulics_statement(
+        section_oids, starttime, endtime, columns)
+
+    df = await pandas_read_sql(statement, db)
+
+    return dict(list(df.groupby('_boreholesection_oid')))
+
+
+async def stream_hydraulics(section_oid: int,
+                            db: AsyncSession,
+                            starttime: datetime = None,
+                            endtime: datetime = None,
+                            defer_cols: list = None) -> AsyncResult:
+    """
+    Stream hydraulic samples ordered by time using a server side cursor.
+    """
+    statement = hydraulics_statement(
+        section_oid, starttime, endtime, hydraulic_columns(defer_cols))
+
+    return await db.stream(statement)
 
 
 async def create_hydraulics(hydraulics: List[dict],
@@ -14,8 +14,7 @@ logger = logging.getLogger(__name__)
 
 class DatabaseSessionManager:
     def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):
-        self._engine = create_async_engine(
-            host, pool_size=10, max_overflow=5, **engine_kwargs)
+        self._engine = create_async_engine(host, **engine_kwargs)
         self._sessionmaker = async_sessionmaker(
             autocommit=False, autoflush=False, bind=self._engine,
             expire_on_commit=False)
@@ -57,8 +56,17 @@ class DatabaseSessionManager:
             await session.close()
 
 
+settings = get_settings()
+
+# every worker process holds its own pool, keep
+# WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below max_connections
 sessionmanager = DatabaseSessionManager(
-    get_settings().SQLALCHEMY_DATABASE_URL, {"echo": False})
+    settings.SQLALCHEMY_DATABASE_URL,
+    {"echo": False,
+     "pool_size": settings.DB_POOL_SIZE,
+     "max_overflow": settings.DB_MAX_OVERFLOW,
+     "pool_timeout": settings.DB_POOL_TIMEOUT,
+     "pool_pre_ping": True})
 
 
 async def get_db():
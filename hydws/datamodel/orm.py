@@ -108,20 +108,13 @@ class HydraulicSample(TimeQuantityMixin('datetime', value_nullable=False,
 
     _boreholesection_oid = Column(
         BigInteger,
-        ForeignKey('boreholesection._oid', ondelete="CASCADE"),
-        index=True)
+        ForeignKey('boreholesection._oid', ondelete="CASCADE"))
     section = relationship("BoreholeSection", back_populates="hydraulics")
 
-    def __ne__(self, other):
-        return not self.__eq__(other)
-
     def __str__(self):
         return "<{}(datetime={})>".format(type(self).__name__,
                                           self.datetime_value.isoformat())
 
-    def __hash__(self):
-        return id(self)
-
     __table_args__ = {
         'postgresql_partition_by': 'RANGE (datetime_value)',
     }
@@ -129,3 +122,9 @@ class HydraulicSample(TimeQuantityMixin('datetime', value_nullable=False,
 
 Index('idx_hydraulicsample_datetime_value', HydraulicSample.datetime_value,
       postgresql_using='brin', postgresql_with={'pages_per_range': 32})
+Index('idx_hydraulicsample_section_datetime_value',
+      HydraulicSample._boreholesection_oid, HydraulicSample.datetime_value)
+Index('idx_borehole_latitude_longitude',
+      Borehole.latitude_value, Borehole.longitude_value)
+Index('idx_boreholesection_starttime_endtime',
+      BoreholeSection.starttime, BoreholeSection.endtime)
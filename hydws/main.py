@@ -2,7 +2,9 @@ import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 
 from config import get_settings
 from config.log_config import setup_logging
@@ -29,16 +31,20 @@ async def lifespan(app: FastAPI):
 app = FastAPI(
     docs_url="/hydws/docs",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     redoc_url=None,
     openapi_url="/hydws/openapi.json")
 
 app.include_router(boreholes.router, prefix='/hydws/v1')
 
+settings = get_settings()
 
-app = CORSMiddleware(
-    app=app,
-    allow_origins=get_settings().ALLOW_ORIGINS,
-    allow_origin_regex=get_settings().ALLOW_ORIGIN_REGEX,
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.ALLOW_ORIGINS,
+    allow_origin_regex=settings.ALLOW_ORIGIN_REGEX or None,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
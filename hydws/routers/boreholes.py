@@ -1,29 +1,57 @@
-import asyncio
+import hashlib
 import logging
 import uuid
 from datetime import datetime
 from typing import Literal
 
+import orjson
 import pandas as pd
-from fastapi import APIRouter, Depends, HTTPException, Response
-from fastapi.responses import ORJSONResponse, PlainTextResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
 from starlette.status import HTTP_204_NO_CONTENT
 
+from config import get_settings
 from hydws import crud
 from hydws.database import DBSessionDep
 from hydws.datamodel.orm import HydraulicSample
 from hydws.schemas import BoreholeSchema, HydraulicSampleSchema
-from hydws.utils import hydraulics_to_json, verify_api_key
+from hydws.utils import (column_paths, hydraulics_to_json, isoformat_seconds,
+                         nest_hydraulic_sample, verify_api_key)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix='/boreholes', tags=['boreholes'])
 
+boreholes_adapter = TypeAdapter(list[BoreholeSchema])
+
+
+def etag_response(request: Request, content: bytes) -> Response:
+    """
+    Return the JSON content with an ETag, or an empty 304 response
+    if the client already holds the same representation.
+    """
+    # weak, the gzip and identity encodings of the body share the tag
+    opaque_tag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+    max_age = get_settings().CACHE_MAX_AGE
+    headers = {'ETag': f'W/{opaque_tag}',
+               'Cache-Control': f'public, max-age={max_age}'}
+
+    # If-None-Match uses weak comparison, proxies may also weaken the tag
+    if_none_match = request.headers.get('if-none-match', '')
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    if '*' in tags or opaque_tag in tags:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content, media_type='application/json', headers=headers)
+
 
 @router.get("",
             response_model=list[BoreholeSchema],
             response_model_exclude_none=True)
-async def get_boreholes(db: DBSessionDep,
+async def get_boreholes(request: Request,
+                        db: DBSessionDep,
                         starttime: datetime | None = None,
                         endtime: datetime | None = None,
                         minlatitude: float | None = None,
@@ -45,27 +73,18 @@ async def get_boreholes(db: DBSessionDep,
         logger.info("No boreholes found")
         raise HTTPException(status_code=404, detail="No boreholes found.")
 
-    return db_result
-
-
-async def await_section_hydraulics(section, db, **kwargs):
-    defer_cols = [HydraulicSample._boreholesection_oid]
-    drop_cols = ['_oid']
+    boreholes = boreholes_adapter.validate_python(db_result,
+                                                  from_attributes=True)
 
-    section_oid = await crud.read_section_oid(section['publicid'], db)
-
-    df = await crud.read_hydraulics_df(
-        section_oid, db, **kwargs, defer_cols=defer_cols)
-
-    section['hydraulics'] = hydraulics_to_json(df, drop_cols)
-
-    return section
+    return etag_response(
+        request, boreholes_adapter.dump_json(boreholes, exclude_none=True))
 
 
 @router.get("/{borehole_id}",
             response_model=BoreholeSchema,
             response_model_exclude_none=True)
 async def get_borehole(borehole_id: uuid.UUID,
+                       request: Request,
                        db: DBSessionDep,
                        level: Literal['borehole',
                                       'section',
@@ -84,22 +103,32 @@ async def get_borehole(borehole_id: uuid.UUID,
         logger.info("Borehole not found: %s", borehole_id)
         raise HTTPException(status_code=404, detail="Borehole not found.")
 
-    borehole = BoreholeSchema.model_validate(db_result) \
-        .model_dump(exclude_none=True)
+    borehole = BoreholeSchema.model_validate(db_result)
+
+    if level != 'hydraulic':
+        return etag_response(
+            request, borehole.model_dump_json(exclude_none=True).encode())
+
+    # json mode turns the asyncpg UUID subclass into strings for orjson
+    borehole = borehole.model_dump(mode='json', exclude_none=True)
+    section_oids = [s._oid for s in db_result.sections]
 
-    if level == 'hydraulic':
-        futures = []
-        for section in borehole['sections']:
-            futures.append(
-                await_section_hydraulics(
-                    section,
-                    db,
-                    starttime=starttime,
-                    endtime=endtime))
+    columns = await crud.read_populated_hydraulic_columns(
+        section_oids, db, starttime, endtime, [HydraulicSample._oid])
 
-        borehole['sections'] = await asyncio.gather(*futures)
+    hydraulics = {} if columns is None else \
+        await crud.read_sections_hydraulics_df(
+            section_oids, db, starttime, endtime, columns)
 
-    return ORJSONResponse(borehole)
+    for section, section_db in zip(borehole['sections'],
+                                   db_result.sections):
+        df = hydraulics.get(section_db._oid)
+        # nesting is CPU bound, keep the event loop free meanwhile
+        section['hydraulics'] = [] if df is None \
+            else await run_in_threadpool(hydraulics_to_json, df,
+                                         ['_boreholesection_oid'])
+
+    return etag_response(request, orjson.dumps(borehole))
 
 
 @router.post("",
@@ -134,17 +163,59 @@ async def delete_borehole(borehole_id: uuid.UUID,
         raise HTTPException(status_code=404, detail="No boreholes found.")
 
 
-def csv_response(data) -> PlainTextResponse:
+def csv_response(data, chunksize: int = 10000) -> StreamingResponse:
     numeric_columns = data.select_dtypes(include='number').columns
     data[numeric_columns] = data[numeric_columns].fillna(0)
 
+    # rows are ordered by datetime_value in the database query
     if 'datetime_value' in data.columns:
-        data = data.sort_values(by='datetime_value')
-        data['datetime_value'] = pd.to_datetime(
-            data['datetime_value']).dt.strftime('%Y-%m-%dT%H:%M:%S')
+        data['datetime_value'] = isoformat_seconds(data['datetime_value'])
+
+    def generate():
+        yield data.iloc[:0].to_csv(index=False)
+        for start in range(0, len(data), chunksize):
+            yield data.iloc[start:start + chunksize].to_csv(index=False,
+                                                            header=False)
 
-    data = data.to_csv(index=False)
-    return PlainTextResponse(data, media_type='text/csv')
+    return StreamingResponse(generate(), media_type='text/csv')
+
+
+async def nested_samples(rows, chunksize: int = 10000):
+    """
+    Yield the streamed hydraulic rows as lists of nested samples.
+    """
+    paths = column_paths(rows.keys())
+
+    async for partition in rows.partitions(chunksize):
+        samples = [nest_hydraulic_sample(paths, row) for row in partition]
+        for sample in samples:
+            # naive datetimes, isoformat gives the same text as strftime
+            # with '%Y-%m-%dT%H:%M:%S' at less than half the cost
+            sample['datetime']['value'] = \
+                sample['datetime']['value'].isoformat(timespec='seconds')
+        yield samples
+
+
+def ndjson_response(rows) -> StreamingResponse:
+    async def generate():
+        async for samples in nested_samples(rows):
+            yield b''.join(orjson.dumps(sample) + b'\n'
+                           for sample in samples)
+
+    return StreamingResponse(generate(), media_type='application/x-ndjson')
+
+
+def json_response(rows) -> StreamingResponse:
+    async def generate():
+        yield b'['
+        separator = b''
+        async for samples in nested_samples(rows):
+            # strip the brackets to join the chunks into a single array
+            yield separator + orjson.dumps(samples)[1:-1]
+            separator = b','
+        yield b']'
+
+    return StreamingResponse(generate(), media_type='application/json')
 
 
 @router.get("/{borehole_id}/sections/{section_id}/hydraulics",
@@ -155,39 +226,39 @@ async def get_section_hydraulics(borehole_id: uuid.UUID,
                                  db: DBSessionDep,
                                  starttime: datetime | None = None,
                                  endtime: datetime | None = None,
-                                 format: Literal['csv', 'json'] = 'json',
+                                 format: Literal['csv',
+                                                 'json',
+                                                 'ndjson'] = 'json',
                                  ):
     """
     Returns section hydraulics.
     """
 
-    db_borehole = await crud.read_borehole(borehole_id, db)
-    if not db_borehole:
+    oids = await crud.read_borehole_section_oids(borehole_id, section_id, db)
+    if not oids:
         logger.info("Borehole not found: %s", borehole_id)
         raise HTTPException(status_code=404, detail="Borehole not found.")
 
     defer_cols = [HydraulicSample._oid,
                   HydraulicSample._boreholesection_oid]
 
-    section_oid = await crud.read_section_oid(section_id, db)
+    section_oid = oids.section_oid
 
-    db_result_df = await crud.read_hydraulics_df(
-        section_oid, db, starttime, endtime, defer_cols)
-
-    db_result_df = db_result_df.dropna(axis=1, how='all')
-
-    if '_oid' in db_result_df.columns:
-        db_result_df = db_result_df.drop(columns=['_oid'])
-
-    if format == 'csv':
-        return csv_response(db_result_df)
+    if format != 'csv':
+        rows = await crud.stream_hydraulics(
+            section_oid, db, starttime, endtime, defer_cols)
+        if format == 'ndjson':
+            return ndjson_response(rows)
+        return json_response(rows)
 
-    if db_result_df.empty:
-        return []
+    columns = await crud.read_populated_hydraulic_columns(
+        section_oid, db, starttime, endtime, defer_cols)
 
-    results = hydraulics_to_json(db_result_df)
+    db_result_df = pd.DataFrame() if columns is None else \
+        await crud.read_hydraulics_df(
+            section_oid, db, starttime, endtime, columns)
 
-    return ORJSONResponse(results)
+    return csv_response(db_result_df)
 
 
 @router.delete("/{borehole_id}/sections/{section_id}/hydraulics",
@@ -204,17 +275,16 @@ async def delete_section_hydraulics(
     """
     Delete hydraulic samples for a section.
     """
-    db_borehole = await crud.read_borehole(borehole_id, db)
-    if not db_borehole:
+    oids = await crud.read_borehole_section_oids(borehole_id, section_id, db)
+    if not oids:
         logger.info("Borehole not found: %s", borehole_id)
         raise HTTPException(status_code=404, detail="Borehole not found.")
 
-    section_oid = await crud.read_section_oid(section_id, db)
-    if section_oid is None:
+    if oids.section_oid is None:
         logger.info("Section not found: %s", section_id)
         raise HTTPException(status_code=404, detail="Section not found.")
 
-    await crud.delete_hydraulics(section_oid, db, starttime, endtime)
+    await crud.delete_hydraulics(oids.section_oid, db, starttime, endtime)
 
 
 @router.delete("/{borehole_id}/sections/{section_id}",
@@ -227,19 +297,14 @@ async def delete_section(
     db: DBSessionDep
 ) -> None:
     """Delete a borehole section and all its hydraulic samples."""
-    db_borehole = await crud.read_borehole(borehole_id, db)
-    if not db_borehole:
+    oids = await crud.read_borehole_section_oids(borehole_id, section_id, db)
+    if not oids:
         logger.info("Borehole not found: %s", borehole_id)
         raise HTTPException(status_code=404, detail="Borehole not found.")
 
-    db_section = await crud.read_section(section_id, db)
-    if db_section is None:
-        logger.info("Section not found: %s", section_id)
-        raise HTTPException(status_code=404, detail="Section not found.")
-
-    # Verify section belongs to the borehole
-    if db_section._borehole_oid != db_borehole._oid:
-        logger.info("Section %s does not belong to borehole %s",
+    # only sections belonging to the borehole are found
+    if oids.section_oid is None:
+        logger.info("Section %s not found in borehole %s",
                     section_id, borehole_id)
         raise HTTPException(status_code=404, detail="Section not found.")
 
@@ -1,11 +1,12 @@
 import uuid
 from datetime import datetime
+from operator import attrgetter
 from typing import Callable, Generic, List, Type, TypeVar
 
 from pydantic import (BaseModel, ConfigDict, Field, computed_field,
-                      create_model, field_validator, model_validator)
+                      create_model, model_validator)
 
-base_config = ConfigDict(extra='allow',
+base_config = ConfigDict(extra='ignore',
                          arbitrary_types_allowed=True,
                          from_attributes=True,
                          use_enum_values=False)
@@ -62,13 +63,23 @@ class RealValueSchema(BaseModel, Generic[DataT]):
 
 
 def real_float_value_factory(name: str, real_type: Type) -> Callable:
+    # parametrize and build the attribute names once instead of on
+    # every access
+    schema = RealValueSchema[real_type]
+    get_values = attrgetter(f'{name}_value',
+                            f'{name}_uncertainty',
+                            f'{name}_loweruncertainty',
+                            f'{name}_upperuncertainty',
+                            f'{name}_confidencelevel')
+
     def create_schema(obj: Model) -> RealValueSchema:
-        return RealValueSchema[real_type](
-            value=getattr(obj, f'{name}_value'),
-            uncertainty=getattr(obj, f'{name}_uncertainty'),
-            loweruncertainty=getattr(obj, f'{name}_loweruncertainty'),
-            upperuncertainty=getattr(obj, f'{name}_upperuncertainty'),
-            confidencelevel=getattr(obj, f'{name}_confidencelevel'))
+        value, uncertainty, lower, upper, confidence = get_values(obj)
+        return schema(
+            value=value,
+            uncertainty=uncertainty,
+            loweruncertainty=lower,
+            upperuncertainty=upper,
+            confidencelevel=confidence)
     return create_schema
 
 
@@ -120,6 +131,26 @@ def flatten_nested(data: dict) -> dict:
     return result
 
 
+def flat_values(model: BaseModel,
+                exclude_unset: bool = False,
+                nested: str | None = None) -> dict:
+    """
+    Return the field values of a model which are not None.
+
+    :param model: The model.
+    :param exclude_unset: Only return fields which were explicitly set.
+    :param nested: Name of a field holding child models, left out.
+    :return: The values by field name.
+    """
+    values = model.__dict__
+    if exclude_unset:
+        # few fields are set on sparse input, look those up only
+        return {name: value for name in model.model_fields_set
+                if name != nested and (value := values.get(name)) is not None}
+    return {name: value for name, value in values.items()
+            if name != nested and value is not None}
+
+
 class HydraulicSampleSchema(real_float_value_mixin('datetime', datetime),
                             real_float_value_mixin('bottomtemperature', float),
                             real_float_value_mixin('bottomflow', float),
@@ -140,15 +171,7 @@ class HydraulicSampleSchema(real_float_value_mixin('datetime', datetime),
 
     def flat_dict(self, exclude_unset=False, exclude_defaults=False) -> dict:
         """Return flat fields for DB operations."""
-        result = {}
-        fields_set = self.model_fields_set if exclude_unset else None
-        for name in self.__class__.model_fields:
-            if exclude_unset and name not in fields_set:
-                continue
-            value = getattr(self, name)
-            if value is not None:
-                result[name] = value
-        return result
+        return flat_values(self, exclude_unset)
 
 
 class BoreholeSectionSchema(
@@ -173,13 +196,6 @@ class BoreholeSectionSchema(
     name: str
     hydraulics: List[HydraulicSampleSchema] | None = None
 
-    @field_validator("publicid")
-    @classmethod
-    def serialize_uuid(cls, value) -> uuid.UUID | None:
-        if value:
-            return uuid.UUID(str(value))
-        return None
-
     @model_validator(mode='before')
     @classmethod
     def handle_nested_input(cls, data):
@@ -187,16 +203,7 @@ class BoreholeSectionSchema(
 
     def flat_dict(self, exclude_unset=False, exclude_defaults=False) -> dict:
         """Return flat fields for DB operations."""
-        result = {}
-        fields_set = self.model_fields_set if exclude_unset else None
-        for name in self.__class__.model_fields:
-            if name == 'hydraulics':
-                continue
-            if exclude_unset and name not in fields_set:
-                continue
-            value = getattr(self, name)
-            if value is not None:
-                result[name] = value
+        result = flat_values(self, exclude_unset, 'hydraulics')
         if self.hydraulics:
             result['hydraulics'] = \
                 [h.flat_dict(exclude_unset, exclude_defaults)
@@ -217,13 +224,6 @@ class BoreholeSchema(CreationInfoMixin,
     institution: str | None = None
     sections: List[BoreholeSectionSchema] | None = None
 
-    @field_validator("publicid")
-    @classmethod
-    def serialize_uuid(cls, value) -> uuid.UUID | None:
-        if value:
-            return uuid.UUID(str(value))
-        return None
-
     @model_validator(mode='before')
     @classmethod
     def handle_nested_input(cls, data):
@@ -231,16 +231,7 @@ class BoreholeSchema(CreationInfoMixin,
 
     def flat_dict(self, exclude_unset=False, exclude_defaults=False) -> dict:
         """Return flat fields for DB operations."""
-        result = {}
-        fields_set = self.model_fields_set if exclude_unset else None
-        for name in self.__class__.model_fields:
-            if name == 'sections':
-                continue
-            if exclude_unset and name not in fields_set:
-                continue
-            value = getattr(self, name)
-            if value is not None:
-                result[name] = value
+        result = flat_values(self, exclude_unset, 'sections')
         if self.sections:
             result['sections'] = [s.flat_dict(exclude_unset, exclude_defaults)
                                   for s in self.sections]
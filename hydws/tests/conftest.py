@@ -7,7 +7,7 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy import text
 
 from config import get_settings
-from hydws.database import sessionmanager
+from hydws.database import get_db, sessionmanager
 from hydws.main import app
 
 
@@ -44,9 +44,33 @@ async def setup_test_database():
 
 
 @pytest.fixture(scope="session")
-async def test_client(setup_test_database):
+async def client():
     async with AsyncClient(
         transport=ASGITransport(app=app),
         base_url="http://test"
     ) as client:
         yield client
+
+
+@pytest.fixture
+async def test_client(setup_test_database, client):
+    """
+    Client whose requests run in one transaction, rolled back after the
+    test. Commits inside the app only release a savepoint.
+    """
+    async with sessionmanager._engine.connect() as connection:
+        transaction = await connection.begin()
+        # same session settings as the app, bound to the test connection
+        session = sessionmanager._sessionmaker(
+            bind=connection, join_transaction_mode='create_savepoint')
+
+        async def get_test_db():
+            yield session
+
+        app.dependency_overrides[get_db] = get_test_db
+        try:
+            yield client
+        finally:
+            app.dependency_overrides.pop(get_db)
+            await session.close()
+            await transaction.rollback()
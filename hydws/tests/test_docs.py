@@ -1,9 +1,11 @@
-from fastapi.testclient import TestClient
-from hydws.main import app
-
-client = TestClient(app)
+async def test_documentation(client):
+    response = await client.get("/hydws/docs")
+    assert response.status_code == 200
 
 
-def test_documentation():
-    response = client.get("/hydws/docs")
+async def test_gzip(client):
+    response = await client.get("/hydws/openapi.json",
+                                headers={"Accept-Encoding": "gzip"})
     assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["openapi"]
@@ -1,6 +1,8 @@
+import csv
+import io
 import json
 import os
-from copy import deepcopy
+import re
 
 from config.config import get_settings
 
@@ -30,10 +32,23 @@ async def test_post(test_client):
         headers=AUTH_HEADERS)
     assert response.status_code == 204
 
-    response = await test_client.get("/hydws/v1/boreholes")
 
+async def test_get_boreholes_zero_bounds(test_client):
+    response = await test_client.post("/hydws/v1/boreholes",
+                                      json=data_1,
+                                      headers=AUTH_HEADERS)
+    assert response.status_code == 200
+
+    # the borehole lies west of greenwich, a bound of 0 must apply
+    response = await test_client.get('/hydws/v1/boreholes',
+                                     params={'minlongitude': 0})
     assert response.status_code == 404
 
+    response = await test_client.get('/hydws/v1/boreholes',
+                                     params={'maxlongitude': 0})
+    assert response.status_code == 200
+    assert response.json()[0]['publicid'] == data['publicid']
+
 
 async def test_merge(test_client):
     response = await test_client.post("/hydws/v1/boreholes",
@@ -60,10 +75,6 @@ async def test_merge(test_client):
 
     assert response.status_code == 204
 
-    response = await test_client.get("/hydws/v1/boreholes")
-
-    assert response.status_code == 404
-
 
 dirname = os.path.dirname(os.path.abspath(__file__))
 
@@ -191,14 +202,16 @@ HYDRAULICS_3 = [
 with open(os.path.join(dirname, 'data.json'), 'r') as file:
     data = json.load(file)
 
-data_1 = deepcopy(data)
-data_1['sections'][0]['hydraulics'] = HYDRAULICS_1
 
-data_2 = deepcopy(data)
-data_2['sections'][0]['hydraulics'] = HYDRAULICS_2
+def with_hydraulics(hydraulics: list[dict]) -> dict:
+    """Shallow copy of the borehole with hydraulics on its first section."""
+    section = {**data['sections'][0], 'hydraulics': hydraulics}
+    return {**data, 'sections': [section, *data['sections'][1:]]}
+
 
-data_3 = deepcopy(data)
-data_3['sections'][0]['hydraulics'] = HYDRAULICS_3
+data_1 = with_hydraulics(HYDRAULICS_1)
+data_2 = with_hydraulics(HYDRAULICS_2)
+data_3 = with_hydraulics(HYDRAULICS_3)
 
 
 async def test_delete_section_hydraulics(test_client):
@@ -248,6 +261,114 @@ async def test_delete_section_hydraulics(test_client):
     assert response.status_code == 204
 
 
+async def test_get_section_hydraulics_ndjson(test_client):
+    response = await test_client.post("/hydws/v1/boreholes",
+                                      json=data_1,
+                                      headers=AUTH_HEADERS)
+    assert response.status_code == 200
+
+    borehole_id = data["publicid"]
+    section_id = data["sections"][0]["publicid"]
+
+    response = await test_client.get(
+        f'/hydws/v1/boreholes/{borehole_id}/sections/{section_id}/hydraulics',
+        params={'format': 'ndjson'})
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert [json.loads(line) for line in response.text.splitlines()] == \
+        HYDRAULICS_1
+
+    response = await test_client.delete(
+        f"/hydws/v1/boreholes/{borehole_id}",
+        headers=AUTH_HEADERS)
+    assert response.status_code == 204
+
+
+async def test_get_section_hydraulics_csv(test_client):
+    response = await test_client.post("/hydws/v1/boreholes",
+                                      json=data_1,
+                                      headers=AUTH_HEADERS)
+    assert response.status_code == 200
+
+    borehole_id = data["publicid"]
+    section_id = data["sections"][0]["publicid"]
+
+    response = await test_client.get(
+        f'/hydws/v1/boreholes/{borehole_id}/sections/{section_id}/hydraulics',
+        params={'format': 'csv'})
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/csv')
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    # only the populated columns are exported
+    assert set(rows[0]) == {'datetime_value', 'toppressure_value'}
+    assert len(rows) == len(HYDRAULICS_1)
+
+    datetimes = [row['datetime_value'] for row in rows]
+    assert datetimes == sorted(datetimes)
+    assert all(re.fullmatch(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}', value)
+               for value in datetimes)
+    assert datetimes == [s['datetime']['value'] for s in HYDRAULICS_1]
+
+    response = await test_client.delete(
+        f"/hydws/v1/boreholes/{borehole_id}",
+        headers=AUTH_HEADERS)
+    assert response.status_code == 204
+
+
+async def test_get_borehole_etag(test_client):
+    response = await test_client.post("/hydws/v1/boreholes",
+                                      json=data_1,
+                                      headers=AUTH_HEADERS)
+    assert response.status_code == 200
+
+    url = f'/hydws/v1/boreholes/{data["publicid"]}'
+
+    response = await test_client.get(url, params={'level': 'hydraulic'})
+    assert response.status_code == 200
+    etag = response.headers['etag']
+
+    response = await test_client.get(url,
+                                     params={'level': 'hydraulic'},
+                                     headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.content == b''
+
+    # weak comparison, a proxy may strip or add the W/ prefix
+    assert etag.startswith('W/')
+    for if_none_match in (etag[2:], f'"other", {etag}', '*'):
+        response = await test_client.get(
+            url,
+            params={'level': 'hydraulic'},
+            headers={'If-None-Match': if_none_match})
+        assert response.status_code == 304
+
+    # a different representation of the same borehole has its own tag
+    response = await test_client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag
+
+
+async def test_get_boreholes_etag(test_client):
+    response = await test_client.post("/hydws/v1/boreholes",
+                                      json=data_1,
+                                      headers=AUTH_HEADERS)
+    assert response.status_code == 200
+
+    response = await test_client.get('/hydws/v1/boreholes')
+    assert response.status_code == 200
+    assert response.headers['cache-control'] == \
+        f'public, max-age={get_settings().CACHE_MAX_AGE}'
+    etag = response.headers['etag']
+
+    response = await test_client.get('/hydws/v1/boreholes',
+                                     headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['etag'] == etag
+
+
 async def test_delete_section_hydraulics_not_found(test_client):
     fake_borehole_id = "00000000-0000-0000-0000-000000000000"
     fake_section_id = "00000000-0000-0000-0000-000000000001"
@@ -307,11 +428,6 @@ async def test_delete_section(test_client):
         headers=AUTH_HEADERS)
     assert response.status_code == 404
 
-    # Clean up - delete borehole
-    response = await test_client.delete(
-        f"/hydws/v1/boreholes/{borehole_id}",
-        headers=AUTH_HEADERS)
-
 
 async def test_delete_section_not_found(test_client):
     """Test 404 responses for non-existent borehole/section."""
@@ -1,9 +1,11 @@
 import io
 
 import pandas as pd
+import pytest
 from numpy.testing import assert_equal
 
-from hydws.utils import hydraulics_to_json, merge_hydraulics
+from hydws.utils import (hydraulics_to_json, isoformat_seconds,
+                         merge_hydraulics)
 
 
 def test_real_values_to_json():
@@ -89,6 +91,17 @@ def test_real_values_to_json():
     empty_df = pd.DataFrame()
     assert hydraulics_to_json(empty_df) == []
 
+    # Test without datetime column
+    with pytest.raises(ValueError):
+        hydraulics_to_json(pd.DataFrame({'toppressure_value': [1.0]}))
+
+
+def test_isoformat_seconds():
+    values = pd.Series([pd.Timestamp('2021-01-01T00:00:00.750'),
+                        pd.Timestamp('2021-12-31T23:59:59')])
+    assert isoformat_seconds(values).tolist() == \
+        ['2021-01-01T00:00:00', '2021-12-31T23:59:59']
+
 
 def test_merge_hydraulics_simple():
     merged = merge_hydraulics(df1, df2)
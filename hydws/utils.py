@@ -10,6 +10,20 @@ from config.config import get_settings
 from hydws.datamodel.orm import BoreholeSection, HydraulicSample
 
 
+def isoformat_seconds(values: pd.Series) -> np.ndarray:
+    """
+    Format datetimes as 'YYYY-MM-DDTHH:MM:SS' strings.
+
+    Casting to second precision lets numpy format the whole column at
+    once instead of calling strftime for every element.
+
+    :param values: The datetimes, or strings parseable as datetimes.
+    :return: The formatted strings.
+    """
+    return pd.to_datetime(values).values \
+        .astype('datetime64[s]').astype(str)
+
+
 def hydraulics_to_json(
         df: pd.DataFrame,
         drop_cols: list[str] = None) -> list[dict]:
@@ -21,9 +35,9 @@ def hydraulics_to_json(
     :param drop_cols: The columns to drop.
     :return: The list of dictionaries.
     """
-    # do some data cleaning
+    # missing values are skipped per sample in nest_hydraulic_sample,
+    # so empty columns don't need to be dropped beforehand
     df = df.drop(drop_cols, axis=1) if drop_cols else df
-    df = df.dropna(axis=1, how='all')
 
     if df.empty:
         return []
@@ -33,30 +47,46 @@ def hydraulics_to_json(
 
     try:
         df = df.sort_values(by='datetime_value')
-        df['datetime_value'] = pd.to_datetime(
-            df['datetime_value']).dt.strftime('%Y-%m-%dT%H:%M:%S')
-    except BaseException:
+        df['datetime_value'] = isoformat_seconds(df['datetime_value'])
+    except KeyError:
         raise ValueError('datetime_value column not found hydraulic samples.')
 
-    # convert to nested dict by splitting column names which have a "_"
-    mylist = []
-    for row in df.itertuples(index=False):
-        result = {}
-        for key, value in row._asdict().items():
-            if value != value:
-                continue
-            if '_' not in key:
-                result[key] = value
-                continue
-            parts = key.split('_')
-            current = result
-            for part in parts[:-1]:
-                current = current.setdefault(part, {})
-            current[parts[-1]] = value
-
-        mylist.append(result)
-
-    return mylist
+    # iterate over plain python lists per column instead of pandas rows
+    paths = column_paths(df.columns)
+    values = [df[col].tolist() for col in df.columns]
+
+    return [nest_hydraulic_sample(paths, row) for row in zip(*values)]
+
+
+def column_paths(columns: list[str]) -> list[list[str]]:
+    """
+    Split flat column names into the keys of their nested position.
+
+    :param columns: The flat column names, eg. 'toppressure_value'.
+    :return: The nesting keys per column, eg. ['toppressure', 'value'].
+    """
+    return [column.split('_') for column in columns]
+
+
+def nest_hydraulic_sample(paths: list[list[str]], values) -> dict:
+    """
+    Convert a flat hydraulic sample to a dictionary with nested
+    RealValues, skipping missing values.
+
+    :param paths: The nesting keys per column, see `column_paths`.
+    :param values: The values of the sample, in the order of `paths`.
+    :return: The nested sample.
+    """
+    result = {}
+    for path, value in zip(paths, values):
+        if value is None or value != value:
+            continue
+        current = result
+        for part in path[:-1]:
+            current = current.setdefault(part, {})
+        current[path[-1]] = value
+
+    return result
 
 
 async def update_section_epoch(